@@ -2,22 +2,44 @@
 Script principal pour l'analyse des campagnes marketing.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import subprocess
 from rich.console import Console
 from rich.progress import Progress
 from shutil import copy2
 
+from src.marketing_analysis.analyzer import MarketingAnalyzer
+
 # Configuration des chemins
 BASE_DIR = Path(__file__).parent
 DATA_DIR = BASE_DIR / "data" / "raw"
 REPORTS_DIR = BASE_DIR / "reports"
 TEMPLATES_DIR = BASE_DIR / "templates"
 DATA_FILE = DATA_DIR / "marketing_campaign_dataset.csv"
+KPIS_DIR = REPORTS_DIR / "kpis"
 
 # Initialisation de la console pour les logs
 console = Console()
 
+def run_analysis():
+    """Exécute l'analyse et persiste les résultats en Parquet pour le rapport."""
+    analyzer = MarketingAnalyzer(str(DATA_FILE))
+    analyzer.clean_data()
+    
+    # KPIs Polars et analyses DuckDB sont indépendants : exécution en parallèle
+    # (les deux moteurs libèrent le GIL pendant les calculs)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        kpis_future = executor.submit(analyzer.calculate_kpis)
+        advanced_future = executor.submit(analyzer.analyze_with_duckdb)
+        results = {**kpis_future.result(), **advanced_future.result()}
+    
+    KPIS_DIR.mkdir(parents=True, exist_ok=True)
+    for name, df in results.items():
+        df.write_parquet(KPIS_DIR / f"{name}.parquet")
+    
+    console.print(f"[green]✓[/green] Résultats d'analyse enregistrés dans {KPIS_DIR}")
+
 def generate_report():
     """Génère le rapport Quarto."""
     # Copie du template vers le dossier reports
@@ -31,7 +53,11 @@ def generate_report():
     try:
         console.print("Génération du rapport Quarto...")
         result = subprocess.run(
-            ["quarto", "render", str(report_path), "--to", "html"],
+            [
+                "quarto", "render", str(report_path), "--to", "html",
+                # Noyau Jupyter réutilisé entre rendus
+                "--execute-daemon", "300"
+            ],
             capture_output=True,
             text=True
         )
@@ -47,6 +73,11 @@ def generate_report():
 def main():
     """Point d'entrée principal du programme."""
     with Progress() as progress:
+        # Analyse des données
+        task = progress.add_task("[blue]Analyse des données...", total=1)
+        run_analysis()
+        progress.update(task, advance=1)
+        
         # Génération du rapport
         task = progress.add_task("[red]Génération du rapport...", total=1)
         generate_report()
@@ -7,7 +7,7 @@ en utilisant Polars et DuckDB pour un traitement efficace des données.
 
 from .analyzer import MarketingAnalyzer
 from .utils import clean_monetary_value, calculate_derived_metrics
-from .visualization import create_performance_plots
+from .visualization import create_performance_plots, fig_to_json_fast
 
 __version__ = "0.1.0"
 __author__ = "Gaël Penessot"
@@ -16,5 +16,6 @@ __all__ = [
     "MarketingAnalyzer",
     "clean_monetary_value",
     "calculate_derived_metrics",
-    "create_performance_plots"
+    "create_performance_plots",
+    "fig_to_json_fast"
 ]
\ No newline at end of file
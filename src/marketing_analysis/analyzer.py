@@ -8,9 +8,43 @@ from pathlib import Path
 from typing import Dict, Any, Tuple
 from datetime import datetime
 
-from .utils import clean_monetary_value, calculate_derived_metrics, format_percentage, format_currency
+from .utils import (
+    clean_monetary_value,
+    calculate_derived_metrics,
+    collect_streaming,
+    format_percentage,
+    format_currency
+)
 from .visualization import create_performance_plots
 
+# Colonnes du CSV effectivement utilisées par l'analyse
+ANALYSIS_COLUMNS = [
+    "Campaign_ID",
+    "Date",
+    "Channel_Used",
+    "Customer_Segment",
+    "Acquisition_Cost",
+    "Clicks",
+    "Impressions",
+    "Conversion_Rate",
+    "ROI",
+    "Engagement_Score"
+]
+
+# Version du format du cache Parquet ; à incrémenter dès que la
+# transformation de _scan_csv change (colonnes, types, nettoyage)
+CACHE_VERSION = 1
+
+# Coûts unitaires dérivés, non agrégés, pour lesquels la précision simple suffit.
+# Les colonnes moyennées dans les KPIs (Conversion_Rate, ROI, CTR,
+# Engagement_Score) restent en Float64 : en Float32 les moyennes dérivent
+# d'environ 1e-4 en relatif.
+FLOAT32_COLUMNS = [
+    "CPM",
+    "CPC",
+    "CPA"
+]
+
 class MarketingAnalyzer:
     """
     Classe principale pour l'analyse des campagnes marketing.
@@ -25,48 +59,118 @@ class MarketingAnalyzer:
             data_path: Chemin vers le fichier CSV des données marketing
         """
         self.data_path = Path(data_path)
+        self.lf = None
         self.df = None
+        self._kpis_cache = None
         self.duckdb_conn = duckdb.connect(':memory:')
         self._load_data()
     
     def _load_data(self) -> None:
-        """Charge les données initiales depuis le fichier CSV."""
+        """
+        Prépare la lecture paresseuse (LazyFrame) des données.
+        
+        Le CSV est converti une seule fois en Parquet (colonnes utiles,
+        montants et dates typés) ; les exécutions suivantes lisent ce cache
+        tant qu'il est plus récent que le CSV et de même version.
+        """
         try:
-            self.df = pl.read_csv(self.data_path)
-            print(f"Données chargées avec succès: {len(self.df)} lignes")
+            cache_path = self.data_path.with_suffix(f".v{CACHE_VERSION}.parquet")
+            try:
+                if self._is_cache_stale(cache_path):
+                    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+                    self._scan_csv().sink_parquet(tmp_path)
+                    tmp_path.replace(cache_path)
+                self.lf = pl.scan_parquet(cache_path)
+            except OSError:
+                # Cache non inscriptible : lecture directe du CSV
+                self.lf = self._scan_csv()
+            
+            n_rows = self.lf.select(pl.len()).collect().item()
+            print(f"Données chargées avec succès: {n_rows} lignes")
         except Exception as e:
             raise RuntimeError(f"Erreur lors du chargement des données: {str(e)}")
 
+    def _is_cache_stale(self, cache_path: Path) -> bool:
+        """
+        Indique si le cache Parquet doit être régénéré.
+        
+        Args:
+            cache_path: Chemin du cache Parquet
+            
+        Returns:
+            True si le cache est absent, plus ancien que le CSV ou si ses
+            colonnes ne correspondent plus à ANALYSIS_COLUMNS
+        """
+        if (
+            not cache_path.exists()
+            or cache_path.stat().st_mtime < self.data_path.stat().st_mtime
+        ):
+            return True
+        try:
+            cached_columns = pl.scan_parquet(cache_path).collect_schema().names()
+        except (pl.exceptions.ComputeError, OSError):
+            # Fichier illisible (écriture interrompue, format invalide)
+            return True
+        return cached_columns != ANALYSIS_COLUMNS
+
+    def _scan_csv(self) -> pl.LazyFrame:
+        """Lecture paresseuse du CSV avec montants et dates typés."""
+        # La projection est poussée jusqu'au lecteur CSV
+        lf = (
+            pl.scan_csv(self.data_path, try_parse_dates=False)
+            .select(ANALYSIS_COLUMNS)
+        )
+        
+        # Nettoyage monétaire et conversion des dates
+        lf = clean_monetary_value(lf, "Acquisition_Cost")
+        return lf.with_columns(
+            pl.col("Date").str.strptime(pl.Date, format="%Y-%m-%d")
+        )
+
     def clean_data(self) -> pl.DataFrame:
         """
         Nettoie et prépare les données marketing pour l'analyse.
         
+        Les transformations sont chaînées sur le LazyFrame puis exécutées
+        en une seule passe (moteur streaming si disponible).
+        
         Returns:
             DataFrame Polars nettoyé
         """
-        if self.df is None:
+        if self.lf is None:
             raise ValueError("Aucune donnée n'a été chargée")
         
         try:
-            # Nettoyage monétaire et conversion des types
-            self.df = clean_monetary_value(self.df, "Acquisition_Cost")
-            
             # Calcul des métriques dérivées
-            self.df = calculate_derived_metrics(self.df)
+            lf = calculate_derived_metrics(self.lf)
             
-            # Conversion des dates
-            self.df = self.df.with_columns(
-                pl.col("Date").str.strptime(pl.Date, format="%Y-%m-%d")
-            )
+            # Conversion des dimensions en catégories
+            # (clés de regroupement entières plutôt que chaînes ; tri
+            # lexical pour conserver l'ordre alphabétique des chaînes)
+            # et des coûts unitaires dérivés en Float32
+            lf = lf.with_columns([
+                pl.col("Customer_Segment").cast(pl.Categorical("lexical")),
+                pl.col("Channel_Used").cast(pl.Categorical("lexical")),
+                pl.col(FLOAT32_COLUMNS).cast(pl.Float32)
+            ])
+            
+            # Tri chronologique unique, réutilisé par l'analyse temporelle
+            lf = lf.sort("Date")
             
+            self.df = collect_streaming(lf)
+            self._kpis_cache = None
             return self.df
             
         except Exception as e:
             raise RuntimeError(f"Erreur lors du nettoyage des données: {str(e)}")
 
-    def calculate_kpis(self) -> Dict[str, Any]:
+    def calculate_kpis(self, invalidate: bool = False) -> Dict[str, Any]:
         """
         Calcule les KPIs essentiels des campagnes marketing.
+        Le résultat est mis en cache jusqu'au prochain nettoyage des données.
+        
+        Args:
+            invalidate: Force le recalcul même si les KPIs sont en cache
         
         Returns:
             Dict contenant les différents KPIs calculés
@@ -74,28 +178,36 @@ class MarketingAnalyzer:
         if self.df is None:
             raise ValueError("Aucune donnée n'a été chargée")
 
+        if self._kpis_cache is not None and not invalidate:
+            return self._kpis_cache
+
         try:
-            # Performance globale
-            overall_metrics = self._calculate_global_metrics()
-            
-            # Performances par dimensions
-            channel_perf = self._analyze_channel_performance()
-            segment_perf = self._analyze_segment_performance()
-            temporal_perf = self._analyze_temporal_performance()
+            # Les quatre agrégations sont exécutées ensemble pour partager
+            # le scan des données et les sous-plans communs
+            overall_metrics, channel_perf, segment_perf, temporal_perf = pl.collect_all([
+                # Performance globale
+                self._calculate_global_metrics(),
+                
+                # Performances par dimensions
+                self._analyze_channel_performance(),
+                self._analyze_segment_performance(),
+                self._analyze_temporal_performance()
+            ])
             
-            return {
+            self._kpis_cache = {
                 "overall_metrics": overall_metrics,
                 "channel_performance": channel_perf,
                 "segment_performance": segment_perf,
                 "temporal_analysis": temporal_perf
             }
+            return self._kpis_cache
             
         except Exception as e:
             raise RuntimeError(f"Erreur lors du calcul des KPIs: {str(e)}")
 
-    def _calculate_global_metrics(self) -> pl.DataFrame:
+    def _calculate_global_metrics(self) -> pl.LazyFrame:
         """Calcule les métriques globales."""
-        return self.df.select([
+        return self.df.lazy().select([
             pl.col("Conversion_Rate").mean().alias("avg_conversion_rate"),
             pl.col("ROI").mean().alias("avg_roi"),
             pl.col("Acquisition_Cost").sum().alias("total_spend"),
@@ -103,56 +215,55 @@ class MarketingAnalyzer:
             pl.col("Engagement_Score").mean().alias("avg_engagement")
         ])
 
-    def _analyze_channel_performance(self) -> pl.DataFrame:
+    def _analyze_channel_performance(self) -> pl.LazyFrame:
         """Analyse la performance par canal."""
         return (
-            self.df.group_by("Channel_Used")
+            self.df.lazy().group_by("Channel_Used")
             .agg([
                 pl.col("Conversion_Rate").mean().alias("avg_conversion"),
                 pl.col("ROI").mean().alias("avg_roi"),
-                pl.count().alias("campaign_count"),
+                pl.len().alias("campaign_count"),
                 pl.col("Engagement_Score").mean().alias("avg_engagement"),
                 pl.col("Acquisition_Cost").sum().alias("total_cost")
             ])
             .sort("avg_roi", descending=True)
         )
 
-    def _analyze_segment_performance(self) -> pl.DataFrame:
+    def _analyze_segment_performance(self) -> pl.LazyFrame:
         """Analyse la performance par segment client."""
         return (
-            self.df.group_by("Customer_Segment")
+            self.df.lazy().group_by("Customer_Segment")
             .agg([
                 pl.col("Conversion_Rate").mean().alias("avg_conversion"),
                 pl.col("ROI").mean().alias("avg_roi"),
                 pl.col("Engagement_Score").mean().alias("avg_engagement"),
-                pl.count().alias("campaign_count")
+                pl.len().alias("campaign_count")
             ])
             .sort("avg_roi", descending=True)
         )
 
-    def _analyze_temporal_performance(self) -> pl.DataFrame:
-        """Analyse la performance temporelle."""
+    def _analyze_temporal_performance(self) -> pl.LazyFrame:
+        """Analyse la performance temporelle (données déjà triées par date)."""
         return (
-            self.df.group_by("Date")
+            self.df.lazy().group_by("Date", maintain_order=True)
             .agg([
                 pl.col("ROI").mean().alias("avg_roi"),
                 pl.col("Conversion_Rate").mean().alias("avg_conversion"),
                 pl.col("Clicks").sum().alias("total_clicks"),
                 pl.col("Acquisition_Cost").sum().alias("daily_spend")
             ])
-            .sort("Date")
         )
 
     def analyze_with_duckdb(self) -> Dict[str, pl.DataFrame]:
         """
-        Effectue des analyses avancées avec DuckDB.
+        Effectue des analyses avancées (cohortes avec DuckDB).
         
         Returns:
-            Dict contenant les résultats des analyses DuckDB
+            Dict contenant les résultats des analyses avancées
         """
         try:
-            # Enregistrement des données dans DuckDB
-            self.duckdb_conn.register("marketing_data", self.df.to_pandas())
+            # Enregistrement des données dans DuckDB (Arrow, sans copie)
+            self.duckdb_conn.register("marketing_data", self.df.to_arrow())
             
             # Analyses avancées
             segment_channel = self._analyze_segment_channel_performance()
@@ -167,21 +278,24 @@ class MarketingAnalyzer:
             raise RuntimeError(f"Erreur lors de l'analyse DuckDB: {str(e)}")
 
     def _analyze_segment_channel_performance(self) -> pl.DataFrame:
-        """Analyse croisée segments/canaux avec DuckDB."""
-        query = """
-        SELECT 
-            Customer_Segment,
-            Channel_Used,
-            AVG(Conversion_Rate) as avg_conversion,
-            AVG(ROI) as avg_roi,
-            COUNT(*) as campaign_count,
-            SUM(Acquisition_Cost) as total_cost
-        FROM marketing_data
-        GROUP BY Customer_Segment, Channel_Used
-        HAVING campaign_count >= 10
-        ORDER BY avg_roi DESC
         """
-        return pl.from_pandas(self.duckdb_conn.execute(query).df())
+        Analyse croisée segments/canaux.
+        Calculée directement avec Polars sur les données déjà en mémoire ;
+        seules les combinaisons d'au moins 10 campagnes sont conservées.
+        """
+        return (
+            self.df.lazy()
+            .group_by(["Customer_Segment", "Channel_Used"])
+            .agg([
+                pl.col("Conversion_Rate").mean().alias("avg_conversion"),
+                pl.col("ROI").mean().alias("avg_roi"),
+                pl.len().cast(pl.Int64).alias("campaign_count"),
+                pl.col("Acquisition_Cost").sum().alias("total_cost")
+            ])
+            .filter(pl.col("campaign_count") >= 10)
+            .sort("avg_roi", descending=True)
+            .collect()
+        )
 
     def _analyze_cohorts(self) -> pl.DataFrame:
         """Analyse des cohortes avec DuckDB."""
@@ -196,7 +310,7 @@ class MarketingAnalyzer:
         GROUP BY 1, 2
         ORDER BY 1, 2
         """
-        return pl.from_pandas(self.duckdb_conn.execute(query).df())
+        return self.duckdb_conn.execute(query).pl()
     
     def create_visualizations(self) -> Dict[str, Any]:
             """
@@ -209,7 +323,7 @@ class MarketingAnalyzer:
                 raise ValueError("Aucune donnée n'a été chargée")
 
             try:
-                # On récupère d'abord les KPIs nécessaires
+                # On récupère d'abord les KPIs nécessaires (en cache si déjà calculés)
                 kpis = self.calculate_kpis()
                 
                 # On utilise la fonction de visualization.py
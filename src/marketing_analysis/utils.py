@@ -7,13 +7,41 @@ from typing import Any, List, Dict, Union, Tuple
 import numpy as np
 from datetime import datetime, date
 
-def clean_monetary_value(df: pl.DataFrame, column: str) -> pl.DataFrame:
+Frame = Union[pl.DataFrame, pl.LazyFrame]
+
+# `min_periods` a été renommé `min_samples` dans polars 1.21 (puis supprimé
+# en 2.0) : le mot-clé est choisi selon la version installée
+_POLARS_VERSION = tuple(int(part) for part in pl.__version__.split(".")[:2])
+_ROLLING_MIN_KWARG = "min_samples" if _POLARS_VERSION >= (1, 21) else "min_periods"
+
+def collect_streaming(lf: pl.LazyFrame) -> pl.DataFrame:
+    """
+    Exécute un LazyFrame avec le moteur streaming de Polars.
+    Les versions antérieures au nouveau moteur (polars < 1.23) rejettent
+    engine="streaming" : on utilise alors l'ancien paramètre streaming=True.
+    
+    Args:
+        lf: LazyFrame à matérialiser
+        
+    Returns:
+        DataFrame matérialisé
+    """
+    try:
+        return lf.collect(engine="streaming")
+    except (TypeError, ValueError) as e:
+        # Seul le rejet de l'argument engine déclenche le repli ; les
+        # erreurs de la requête elle-même sont propagées
+        if "engine" not in str(e):
+            raise
+        return lf.collect(streaming=True)
+
+def clean_monetary_value(df: Frame, column: str) -> Frame:
     """
     Nettoie une colonne contenant des valeurs monétaires.
     Gère à la fois les formats avec et sans décimales ($1234.00 et $1234).
     
     Args:
-        df: DataFrame source
+        df: DataFrame ou LazyFrame source
         column: Nom de la colonne à nettoyer
         
     Returns:
@@ -21,24 +49,23 @@ def clean_monetary_value(df: pl.DataFrame, column: str) -> pl.DataFrame:
     """
     return df.with_columns([
         pl.col(column)
-            .str.strip_chars()         # Supprime les espaces avec l'API Polars correcte
-            .str.replace(r"\$", "")    # Supprime le symbole dollar
-            .str.replace(r",", "")     # Supprime les virgules
-            .cast(pl.Float64)          # Convertit en Float64
+            .str.replace_all(r"[\s$,]", "")  # Supprime espaces, dollars et virgules en une passe
+            .cast(pl.Float64)                # Convertit en Float64
             .alias(column)
     ])
 
-def calculate_derived_metrics(df: pl.DataFrame) -> pl.DataFrame:
+def calculate_derived_metrics(df: Frame) -> Frame:
     """
     Calcule les métriques dérivées pour l'analyse marketing.
+    Les catégories de performance sont ajoutées dans le même `with_columns`.
     
     Args:
-        df: DataFrame source
+        df: DataFrame ou LazyFrame source
         
     Returns:
         DataFrame avec les métriques dérivées ajoutées
     """
-    derived = df.with_columns([
+    return df.with_columns([
         # CTR (Click-Through Rate)
         (pl.col("Clicks") / pl.col("Impressions")).alias("CTR"),
         
@@ -51,49 +78,79 @@ def calculate_derived_metrics(df: pl.DataFrame) -> pl.DataFrame:
         # Conversions totales
         (pl.col("Conversion_Rate") * pl.col("Clicks")).alias("Total_Conversions"),
         
-        # CPA (Cost per Acquisition)
-        (pl.col("Acquisition_Cost") / (pl.col("Conversion_Rate") * pl.col("Clicks")))
-            .alias("CPA")
-    ])
-    
-    # Ajout des catégories de performance
-    return add_performance_categories(derived)
+        # Catégories de performance
+        *performance_category_exprs()
+    ]).with_columns(
+        # CPA (Cost per Acquisition), réutilise les conversions totales
+        (pl.col("Acquisition_Cost") / pl.col("Total_Conversions")).alias("CPA")
+    )
 
-def add_performance_categories(df: pl.DataFrame) -> pl.DataFrame:
+def _threshold_category(column: str,
+                        breaks: List[float],
+                        labels: List[str]) -> pl.Expr:
     """
-    Ajoute des catégories de performance basées sur différentes métriques.
+    Construit une catégorie par seuils (bornes inférieures incluses).
+    Les valeurs manquantes reçoivent le libellé le plus bas.
     
     Args:
-        df: DataFrame source
+        column: Nom de la colonne métrique
+        breaks: Seuils croissants
+        labels: Libellés, un de plus que de seuils, du plus bas au plus haut
         
     Returns:
-        DataFrame avec les catégories de performance ajoutées
+        Expression Polars produisant une colonne Categorical
     """
-    return df.with_columns([
+    # `cut` renvoie null pour les nulls : on les range dans la catégorie
+    # la plus basse, comme le faisait le `otherwise` des anciennes chaînes
+    return (
+        pl.col(column)
+          .cut(breaks, labels=labels, left_closed=True)
+          .fill_null(labels[0])
+    )
+
+def performance_category_exprs() -> List[pl.Expr]:
+    """
+    Construit les expressions des catégories de performance.
+    Chaque catégorie est un découpage par seuils (bornes inférieures
+    incluses) produisant une colonne Categorical.
+    
+    Returns:
+        Liste d'expressions Polars produisant les colonnes de catégories
+    """
+    return [
         # Catégorie ROI
-        pl.when(pl.col("ROI") >= 7)
-          .then(pl.lit("Haute performance"))
-          .when(pl.col("ROI") >= 5)
-          .then(pl.lit("Performance moyenne"))
-          .otherwise(pl.lit("Basse performance"))
-          .alias("ROI_Category"),
+        _threshold_category(
+            "ROI",
+            breaks=[5, 7],
+            labels=["Basse performance", "Performance moyenne", "Haute performance"]
+        ).alias("ROI_Category"),
           
         # Catégorie Engagement
-        pl.when(pl.col("Engagement_Score") >= 8)
-          .then(pl.lit("Très engageant"))
-          .when(pl.col("Engagement_Score") >= 6)
-          .then(pl.lit("Engageant"))
-          .otherwise(pl.lit("Peu engageant"))
-          .alias("Engagement_Category"),
+        _threshold_category(
+            "Engagement_Score",
+            breaks=[6, 8],
+            labels=["Peu engageant", "Engageant", "Très engageant"]
+        ).alias("Engagement_Category"),
           
         # Catégorie Conversion
-        pl.when(pl.col("Conversion_Rate") >= 0.1)
-          .then(pl.lit("Haute conversion"))
-          .when(pl.col("Conversion_Rate") >= 0.05)
-          .then(pl.lit("Conversion moyenne"))
-          .otherwise(pl.lit("Basse conversion"))
-          .alias("Conversion_Category")
-    ])
+        _threshold_category(
+            "Conversion_Rate",
+            breaks=[0.05, 0.1],
+            labels=["Basse conversion", "Conversion moyenne", "Haute conversion"]
+        ).alias("Conversion_Category")
+    ]
+
+def add_performance_categories(df: Frame) -> Frame:
+    """
+    Ajoute des catégories de performance basées sur différentes métriques.
+    
+    Args:
+        df: DataFrame ou LazyFrame source
+        
+    Returns:
+        DataFrame avec les catégories de performance ajoutées
+    """
+    return df.with_columns(performance_category_exprs())
 
 
 def calculate_growth_metrics(df: pl.DataFrame) -> Dict[str, float]:
@@ -108,7 +165,7 @@ def calculate_growth_metrics(df: pl.DataFrame) -> Dict[str, float]:
     """
     # Calcul des moyennes par période
     period_metrics = (
-        df.groupby("Date")
+        df.group_by("Date")
         .agg([
             pl.col("ROI").mean().alias("avg_roi"),
             pl.col("Conversion_Rate").mean().alias("avg_conversion"),
@@ -119,15 +176,15 @@ def calculate_growth_metrics(df: pl.DataFrame) -> Dict[str, float]:
     
     # Calcul des variations
     roi_growth = calculate_percentage_change(
-        period_metrics["avg_roi"].to_list()
+        period_metrics["avg_roi"]
     )
     
     conversion_growth = calculate_percentage_change(
-        period_metrics["avg_conversion"].to_list()
+        period_metrics["avg_conversion"]
     )
     
     spend_growth = calculate_percentage_change(
-        period_metrics["total_spend"].to_list()
+        period_metrics["total_spend"]
     )
     
     return {
@@ -136,17 +193,18 @@ def calculate_growth_metrics(df: pl.DataFrame) -> Dict[str, float]:
         "spend_growth": spend_growth
     }
 
-def calculate_percentage_change(values: List[float]) -> float:
+def calculate_percentage_change(values: Union[pl.Series, List[float]]) -> float:
     """
     Calcule la variation en pourcentage entre la première et la dernière valeur.
+    Seules ces deux valeurs sont lues : une Series n'est pas convertie en liste.
     
     Args:
-        values: Liste des valeurs
+        values: Series Polars ou liste des valeurs
         
     Returns:
         Pourcentage de variation
     """
-    if not values or len(values) < 2:
+    if values is None or len(values) < 2:
         return 0.0
     
     start_value = values[0]
@@ -162,6 +220,8 @@ def calculate_moving_averages(df: pl.DataFrame,
                             windows: List[int] = [7, 30]) -> pl.DataFrame:
     """
     Calcule les moyennes mobiles pour une métrique donnée.
+    Le tri par date n'est effectué que si les données ne sont pas déjà
+    triées (cas du DataFrame produit par `MarketingAnalyzer.clean_data`).
     
     Args:
         df: DataFrame source
@@ -171,16 +231,15 @@ def calculate_moving_averages(df: pl.DataFrame,
     Returns:
         DataFrame avec les moyennes mobiles ajoutées
     """
-    result = df.sort("Date")
-    
-    for window in windows:
-        result = result.with_columns([
-            pl.col(metric)
-              .rolling_mean(window_size=window)
-              .alias(f"{metric}_MA_{window}")
-        ])
+    result = df if df["Date"].is_sorted() else df.sort("Date")
     
-    return result
+    # Toutes les fenêtres sont calculées en une seule passe
+    return result.with_columns([
+        pl.col(metric)
+          .rolling_mean(window_size=window, **{_ROLLING_MIN_KWARG: 1})
+          .alias(f"{metric}_MA_{window}")
+        for window in windows
+    ])
 
 def segment_analysis(df: pl.DataFrame) -> Dict[str, pl.DataFrame]:
     """
@@ -194,24 +253,24 @@ def segment_analysis(df: pl.DataFrame) -> Dict[str, pl.DataFrame]:
     """
     # Performance par segment
     segment_performance = (
-        df.groupby("Customer_Segment")
+        df.group_by("Customer_Segment")
         .agg([
             pl.col("ROI").mean().alias("avg_roi"),
             pl.col("Conversion_Rate").mean().alias("avg_conversion"),
             pl.col("Engagement_Score").mean().alias("avg_engagement"),
             pl.col("Acquisition_Cost").sum().alias("total_spend"),
-            pl.count().alias("campaign_count")
+            pl.len().alias("campaign_count")
         ])
         .sort("avg_roi", descending=True)
     )
     
     # Performance segment x canal
     segment_channel = (
-        df.groupby(["Customer_Segment", "Channel_Used"])
+        df.group_by(["Customer_Segment", "Channel_Used"])
         .agg([
             pl.col("ROI").mean().alias("avg_roi"),
             pl.col("Conversion_Rate").mean().alias("avg_conversion"),
-            pl.count().alias("campaign_count")
+            pl.len().alias("campaign_count")
         ])
         .sort(["Customer_Segment", "avg_roi"], descending=[False, True])
     )
@@ -233,8 +292,7 @@ def calculate_efficiency_metrics(df: pl.DataFrame) -> pl.DataFrame:
     """
     return df.with_columns([
         # ROAS (Return on Ad Spend)
-        (pl.col("ROI") * pl.col("Acquisition_Cost") / pl.col("Acquisition_Cost"))
-            .alias("ROAS"),
+        pl.col("ROI").alias("ROAS"),
         
         # Efficacité du budget
         (pl.col("Total_Conversions") / pl.col("Acquisition_Cost"))
@@ -2,11 +2,187 @@
 Fonctions de visualisation pour l'analyse marketing avec Plotly.
 """
 
-import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import polars as pl
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from functools import wraps
+from itertools import chain
+from typing import Dict, Any, Callable, List, Optional, Tuple
+import numpy as np
+
+from .utils import Frame, collect_streaming
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba est optionnel
+    njit = None
+
+try:
+    from tsdownsample import LTTBDownsampler
+except ImportError:  # tsdownsample est optionnel
+    LTTBDownsampler = None
+
+try:
+    import orjson
+except ImportError:  # orjson est optionnel
+    orjson = None
+
+# Trace d'un sous-graphique avec sa position : (trace, ligne, colonne, axe y secondaire)
+SubplotTrace = Tuple[Any, int, int, bool]
+
+# Styles partagés par les traces
+_LINE_ROI = dict(color="#1f77b4", width=2)
+_LINE_CONV = dict(color="#ff7f0e", width=2)
+_LINE_ROI_THIN = dict(color="#1f77b4")
+_LINE_CONV_THIN = dict(color="#ff7f0e")
+_BAR_ROI = dict(color="#1f77b4")
+_MARKER_ROI = dict(color="#1f77b4")
+
+# Légende horizontale en haut à droite, partagée par toutes les figures
+_LEGEND_TOP = dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+
+# Template Plotly du projet, pour les figures construites hors de ce module
+# (ex. template="plotly_white+marketing"). Les fonctions ci-dessous appliquent
+# directement _LEGEND_TOP : assigner un template force Plotly à le copier
+# entièrement et remplacerait pio.templates.default.
+pio.templates["marketing"] = go.layout.Template(layout=dict(legend=_LEGEND_TOP))
+
+# Dernier template par défaut vu et nombre de changements : Plotly fige
+# pio.templates.default dans chaque figure à sa création, le cache de figures
+# doit donc en tenir compte (un objet Template n'est pas hachable)
+_default_template_state: Dict[str, Any] = {"template": None, "generation": 0}
+
+def _default_template_generation() -> int:
+    """
+    Identifie la valeur courante de `pio.templates.default`.
+    
+    Returns:
+        Compteur incrémenté à chaque changement du template par défaut
+    """
+    default = pio.templates.default
+    previous = _default_template_state["template"]
+    unchanged = previous is default or (
+        isinstance(default, str) and isinstance(previous, str) and default == previous
+    )
+    if not unchanged:
+        _default_template_state["template"] = default
+        _default_template_state["generation"] += 1
+    return _default_template_state["generation"]
+
+# Au-delà de ce nombre de points, les nuages de points passent en WebGL
+WEBGL_THRESHOLD = 1000
+
+# Nombre maximal de figures mémorisées par fonction de visualisation
+FIGURE_CACHE_SIZE = 32
+
+# Nombre maximal de points tracés par courbe temporelle (sous-échantillonnage LTTB)
+MAX_LINE_POINTS = 2000
+
+# Au-delà de ce nombre de lignes, l'entonnoir est agrégé par Numba (si installé)
+NUMBA_FUNNEL_THRESHOLD = 1_000_000
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _funnel_totals_numba(impressions, clicks, engagement, conversion):
+        """Calcule les quatre totaux de l'entonnoir en une seule boucle."""
+        total_impressions = 0.0
+        total_clicks = 0.0
+        total_interactions = 0.0
+        total_conversions = 0.0
+        for i in prange(clicks.shape[0]):
+            c = clicks[i]
+            total_impressions += impressions[i]
+            total_clicks += c
+            total_interactions += c * engagement[i] * 0.1
+            total_conversions += c * conversion[i]
+        return total_impressions, total_clicks, total_interactions, total_conversions
+
+# Grille 2x2 du dashboard de synthèse, construite une seule fois à l'import
+_OVERVIEW_TEMPLATE = make_subplots(
+    rows=2, cols=2,
+    subplot_titles=(
+        "Tendances temporelles",
+        "Performance par canal",
+        "Performance par segment",
+        "Distribution des métriques"
+    ),
+    specs=[[{"secondary_y": True}, {"secondary_y": False}],
+           [{"secondary_y": False}, {"secondary_y": False}]]
+)
+
+def _frame_fingerprint(df: pl.DataFrame) -> tuple:
+    """
+    Empreinte du contenu d'un DataFrame (schéma, forme, hachage des lignes).
+    Les colonnes catégorielles sont hachées sur leurs libellés : leurs codes
+    physiques peuvent être identiques pour des libellés différents.
+    """
+    row_hashes = (
+        df.with_columns(pl.col(pl.Categorical, pl.Enum).cast(pl.String))
+        .hash_rows(seed=0)
+        .to_numpy()
+        .tobytes()
+    )
+    return (str(df.schema), df.shape, hash(row_hashes))
+
+def _fig_cache(func: Callable[..., go.Figure]) -> Callable[..., go.Figure]:
+    """
+    Mémoïse une fonction de visualisation selon l'empreinte du DataFrame reçu.
+    Une copie de la figure est renvoyée pour que l'appelant puisse la modifier
+    sans altérer le cache. Les LazyFrame ne sont pas mis en cache.
+    """
+    cache: "OrderedDict[tuple, go.Figure]" = OrderedDict()
+    
+    @wraps(func)
+    def wrapper(df: Frame, *args, **kwargs) -> go.Figure:
+        if isinstance(df, pl.LazyFrame):
+            return func(df, *args, **kwargs)
+        
+        # Le template courant fait partie de la clé : changer
+        # pio.templates.default ne doit pas renvoyer une figure périmée
+        key = (
+            _frame_fingerprint(df),
+            _default_template_generation(),
+            args,
+            tuple(sorted(kwargs.items()))
+        )
+        if key in cache:
+            cache.move_to_end(key)
+        else:
+            cache[key] = func(df, *args, **kwargs)
+            if len(cache) > FIGURE_CACHE_SIZE:
+                cache.popitem(last=False)
+        return go.Figure(cache[key])
+    
+    wrapper.cache_clear = cache.clear
+    return wrapper
+
+def _np(s: pl.Series) -> np.ndarray:
+    """Convertit une Series en ndarray (sérialisation rapide par Plotly)."""
+    return s.to_numpy()
+
+def _date_np(s: pl.Series) -> np.ndarray:
+    """
+    Convertit une Series de dates en millisecondes depuis l'epoch (int64).
+    À utiliser avec un axe Plotly de type "date".
+    """
+    return s.cast(pl.Datetime("ms")).to_physical().to_numpy()
+
+def _downsample(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Réduit une courbe à MAX_LINE_POINTS points avec l'algorithme LTTB,
+    qui préserve la forme visuelle. Sans effet si tsdownsample n'est pas
+    installé ou si la courbe est déjà assez courte.
+    """
+    if LTTBDownsampler is None or len(x) <= MAX_LINE_POINTS:
+        return x, y
+    idx = LTTBDownsampler().downsample(x, y, n_out=MAX_LINE_POINTS)
+    return x[idx], y[idx]
+
+def _scatter_type(n_points: int) -> type:
+    """Choisit Scattergl (canvas WebGL) pour les gros volumes, Scatter (SVG) sinon."""
+    return go.Scattergl if n_points > WEBGL_THRESHOLD else go.Scatter
 
 def create_performance_plots(
     temporal_data: pl.DataFrame,
@@ -33,6 +209,7 @@ def create_performance_plots(
         )
     }
 
+@_fig_cache
 def create_temporal_analysis(df: pl.DataFrame) -> go.Figure:
     """
     Crée une visualisation des tendances temporelles.
@@ -43,16 +220,21 @@ def create_temporal_analysis(df: pl.DataFrame) -> go.Figure:
     Returns:
         Figure Plotly
     """
+    # Courbes sous-échantillonnées pour les longues historiques
+    dates = _date_np(df["Date"])
+    roi_x, roi_y = _downsample(dates, _np(df["avg_roi"]))
+    conv_x, conv_y = _downsample(dates, _np(df["avg_conversion"]))
+    
     # Création d'un graphique avec axes secondaires
     fig = make_subplots(specs=[[{"secondary_y": True}]])
     
     # Ligne pour le ROI
     fig.add_trace(
         go.Scatter(
-            x=df["Date"],
-            y=df["avg_roi"],
+            x=roi_x,
+            y=roi_y,
             name="ROI moyen",
-            line=dict(color="#1f77b4", width=2),
+            line=_LINE_ROI,
             mode="lines"
         ),
         secondary_y=False
@@ -61,10 +243,10 @@ def create_temporal_analysis(df: pl.DataFrame) -> go.Figure:
     # Ligne pour le taux de conversion
     fig.add_trace(
         go.Scatter(
-            x=df["Date"],
-            y=df["avg_conversion"],
+            x=conv_x,
+            y=conv_y,
             name="Taux de conversion",
-            line=dict(color="#ff7f0e", width=2),
+            line=_LINE_CONV,
             mode="lines"
         ),
         secondary_y=True
@@ -75,53 +257,58 @@ def create_temporal_analysis(df: pl.DataFrame) -> go.Figure:
         title="Évolution temporelle des performances",
         xaxis_title="Date",
         hovermode="x unified",
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        )
+        legend=_LEGEND_TOP
     )
     
     # Axes
+    fig.update_xaxes(type="date")
     fig.update_yaxes(title_text="ROI", secondary_y=False)
     fig.update_yaxes(title_text="Taux de conversion", secondary_y=True)
     
     return fig
 
-def create_channel_analysis(df: pl.DataFrame) -> go.Figure:
+@_fig_cache
+def create_channel_analysis(
+    df: Frame,
+    top_n: Optional[int] = None
+) -> go.Figure:
     """
     Crée une visualisation des performances par canal.
     
     Args:
-        df: DataFrame des performances par canal
+        df: DataFrame (ou LazyFrame) des performances par canal, ou données
+            brutes des campagnes (agrégées par canal si nécessaire)
+        top_n: Nombre optionnel de canaux à afficher, par ROI décroissant
         
     Returns:
         Figure Plotly
     """
+    channel = _prep_channel(df, top_n)
+    
     # Graphique en barres avec indicateurs multiples
     fig = go.Figure()
     
     # Barres pour le ROI
     fig.add_trace(
         go.Bar(
-            x=df["Channel_Used"],
-            y=df["avg_roi"],
+            x=channel["x"],
+            y=channel["roi"],
             name="ROI moyen",
-            marker_color="#1f77b4"
+            marker=_BAR_ROI,
+            hoverinfo="x+y+name"
         )
     )
     
     # Ligne pour l'engagement
     fig.add_trace(
         go.Scatter(
-            x=df["Channel_Used"],
-            y=df["avg_engagement"],
+            x=channel["x"],
+            y=channel["eng"],
             name="Score d'engagement",
             mode="lines+markers",
-            line=dict(color="#ff7f0e", width=2),
-            yaxis="y2"
+            line=_LINE_CONV,
+            yaxis="y2",
+            hoverinfo="x+y+name"
         )
     )
     
@@ -136,17 +323,46 @@ def create_channel_analysis(df: pl.DataFrame) -> go.Figure:
             overlaying="y",
             side="right"
         ),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        )
+        legend=_LEGEND_TOP
     )
     
     return fig
 
+def _prep_channel(df: Frame, top_n: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Prépare les tableaux du graphique par canal en un seul plan paresseux
+    (agrégation éventuelle, tri par ROI décroissant, top N, projection).
+    
+    Args:
+        df: Performances par canal ou données brutes des campagnes
+        top_n: Nombre optionnel de canaux à conserver
+        
+    Returns:
+        Dict des tableaux NumPy "x" (canaux), "roi" et "eng" (engagement)
+    """
+    lf = df.lazy()
+    
+    # Données brutes : agrégation par canal dans le même plan
+    if "avg_roi" not in lf.collect_schema().names():
+        lf = lf.group_by("Channel_Used").agg([
+            pl.col("ROI").mean().alias("avg_roi"),
+            pl.col("Engagement_Score").mean().alias("avg_engagement")
+        ])
+    
+    lf = lf.sort("avg_roi", descending=True)
+    if top_n is not None:
+        lf = lf.head(top_n)
+    
+    channel = collect_streaming(
+        lf.select(["Channel_Used", "avg_roi", "avg_engagement"])
+    )
+    return {
+        "x": _np(channel["Channel_Used"]),
+        "roi": _np(channel["avg_roi"]),
+        "eng": _np(channel["avg_engagement"])
+    }
+
+@_fig_cache
 def create_segment_analysis(df: pl.DataFrame) -> go.Figure:
     """
     Crée une matrice de performance des segments.
@@ -157,29 +373,48 @@ def create_segment_analysis(df: pl.DataFrame) -> go.Figure:
     Returns:
         Figure Plotly
     """
-    # Création du scatter plot
-    fig = px.scatter(
-        df.to_pandas(),
-        x="avg_conversion",
-        y="avg_roi",
-        size="campaign_count",
-        color="Customer_Segment",
-        hover_data=["avg_engagement"],
-        title="Matrice de performance des segments"
-    )
+    # Création du scatter plot, directement depuis les colonnes Polars
+    fig = go.Figure()
+    
+    # Taille des bulles proportionnelle à l'aire (équivalent de px.scatter)
+    sizeref = 2.0 * df["campaign_count"].max() / (20.0 ** 2)
+    
+    scatter = _scatter_type(len(df))
+    
+    # Une trace par segment pour conserver une légende discrète
+    for segment_df in df.partition_by("Customer_Segment", maintain_order=True):
+        segment, conversion, roi, campaign_count, engagement = segment_df.select([
+            "Customer_Segment", "avg_conversion", "avg_roi",
+            "campaign_count", "avg_engagement"
+        ]).get_columns()
+        
+        fig.add_trace(
+            scatter(
+                x=_np(conversion),
+                y=_np(roi),
+                mode="markers",
+                name=str(segment[0]),
+                marker=dict(
+                    size=_np(campaign_count),
+                    sizemode="area",
+                    sizeref=sizeref
+                ),
+                customdata=_np(engagement),
+                hovertemplate=(
+                    "Taux de conversion: %{x}<br>"
+                    "ROI: %{y}<br>"
+                    "Engagement: %{customdata:.2f}"
+                )
+            )
+        )
     
     # Mise en forme
     fig.update_layout(
+        title="Matrice de performance des segments",
         xaxis_title="Taux de conversion moyen",
         yaxis_title="ROI moyen",
         showlegend=True,
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        )
+        legend=_LEGEND_TOP
     )
     
     return fig
@@ -200,122 +435,172 @@ def create_performance_overview(
     Returns:
         Figure Plotly
     """
-    # Création d'une grille 2x2
-    fig = make_subplots(
-        rows=2, cols=2,
-        subplot_titles=(
-            "Tendances temporelles",
-            "Performance par canal",
-            "Performance par segment",
-            "Distribution des métriques"
-        ),
-        specs=[[{"secondary_y": True}, {"secondary_y": False}],
-               [{"secondary_y": False}, {"secondary_y": False}]]
-    )
+    # Copie de la grille 2x2 pré-construite
+    fig = go.Figure(_OVERVIEW_TEMPLATE)
+    
+    # Construction des traces de chaque sous-graphique, puis ajout à la figure
+    subplot_traces = [
+        _build_temporal_subplot(temporal_data, 1, 1),
+        _build_channel_subplot(channel_data, 1, 2),
+        _build_segment_subplot(segment_data, 2, 1),
+        _build_metrics_subplot(temporal_data, 2, 2)
+    ]
+    
+    for trace, row, col, secondary_y in chain.from_iterable(subplot_traces):
+        fig.add_trace(trace, row=row, col=col, secondary_y=secondary_y)
     
-    # Ajout des sous-graphiques
-    _add_temporal_subplot(fig, temporal_data, row=1, col=1)
-    _add_channel_subplot(fig, channel_data, row=1, col=2)
-    _add_segment_subplot(fig, segment_data, row=2, col=1)
-    _add_metrics_subplot(fig, temporal_data, row=2, col=2)
+    # Dates transmises en millisecondes depuis l'epoch
+    fig.update_xaxes(type="date", row=1, col=1)
     
     # Mise en forme globale
     fig.update_layout(
         height=800,
         showlegend=True,
         title_text="Synthèse des performances marketing",
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        )
+        legend=_LEGEND_TOP
     )
     
     return fig
 
-def _add_temporal_subplot(
-    fig: go.Figure,
+def _build_temporal_subplot(
     df: pl.DataFrame,
     row: int,
     col: int
-) -> None:
-    """Ajoute le sous-graphique temporel."""
-    fig.add_trace(
-        go.Scatter(
-            x=df["Date"],
-            y=df["avg_roi"],
-            name="ROI",
-            line=dict(color="#1f77b4")
-        ),
-        row=row, col=col, secondary_y=False
-    )
+) -> List[SubplotTrace]:
+    """Construit les traces du sous-graphique temporel."""
+    scatter = _scatter_type(len(df))
+    dates = _date_np(df["Date"])
+    roi = _np(df["avg_roi"])
+    conversion = _np(df["avg_conversion"])
     
-    fig.add_trace(
-        go.Scatter(
-            x=df["Date"],
-            y=df["avg_conversion"],
-            name="Conversion",
-            line=dict(color="#ff7f0e")
+    return [
+        (
+            scatter(
+                x=dates,
+                y=roi,
+                name="ROI",
+                line=_LINE_ROI_THIN
+            ),
+            row, col, False
         ),
-        row=row, col=col, secondary_y=True
-    )
+        (
+            scatter(
+                x=dates,
+                y=conversion,
+                name="Conversion",
+                line=_LINE_CONV_THIN
+            ),
+            row, col, True
+        )
+    ]
 
-def _add_channel_subplot(
-    fig: go.Figure,
+def _build_channel_subplot(
     df: pl.DataFrame,
     row: int,
     col: int
-) -> None:
-    """Ajoute le sous-graphique des canaux."""
-    fig.add_trace(
-        go.Bar(
-            x=df["Channel_Used"],
-            y=df["avg_roi"],
-            name="ROI par canal"
-        ),
-        row=row, col=col
-    )
+) -> List[SubplotTrace]:
+    """Construit les traces du sous-graphique des canaux."""
+    channel = _prep_channel(df)
+    
+    return [
+        (
+            go.Bar(
+                x=channel["x"],
+                y=channel["roi"],
+                name="ROI par canal",
+                hoverinfo="x+y+name"
+            ),
+            row, col, False
+        )
+    ]
 
-def _add_segment_subplot(
-    fig: go.Figure,
+def _build_segment_subplot(
     df: pl.DataFrame,
     row: int,
     col: int
-) -> None:
-    """Ajoute le sous-graphique des segments."""
-    fig.add_trace(
-        go.Scatter(
-            x=df["avg_conversion"],
-            y=df["avg_roi"],
-            mode="markers",
-            marker=dict(
-                size=df["campaign_count"],
-                sizeref=2.*max(df["campaign_count"])/(40.**2),
-                sizemin=4
+) -> List[SubplotTrace]:
+    """Construit les traces du sous-graphique des segments."""
+    scatter = _scatter_type(len(df))
+    campaign_count = df["campaign_count"]
+    conversion = _np(df["avg_conversion"])
+    roi = _np(df["avg_roi"])
+    segments = _np(df["Customer_Segment"])
+    
+    return [
+        (
+            scatter(
+                x=conversion,
+                y=roi,
+                mode="markers",
+                marker=dict(
+                    size=_np(campaign_count),
+                    sizeref=2.0 * campaign_count.max() / (40.0 ** 2),
+                    sizemin=4
+                ),
+                text=segments,
+                name="Segments",
+                hoverinfo="x+y+text"
             ),
-            text=df["Customer_Segment"],
-            name="Segments"
-        ),
-        row=row, col=col
-    )
+            row, col, False
+        )
+    ]
 
-def _add_metrics_subplot(
-    fig: go.Figure,
+def _build_metrics_subplot(
     df: pl.DataFrame,
     row: int,
     col: int
-) -> None:
-    """Ajoute le sous-graphique des distributions."""
-    fig.add_trace(
-        go.Box(
-            y=df["avg_roi"],
-            name="Distribution ROI",
-            boxpoints="outliers"
-        ),
-        row=row, col=col
-    )
+) -> List[SubplotTrace]:
+    """
+    Construit les traces du sous-graphique des distributions.
+    Quartiles, moustaches et valeurs aberrantes (règle 1.5 x IQR) sont
+    calculés avec Polars : seules ces statistiques sont envoyées au navigateur.
+    """
+    name = "Distribution ROI"
+    roi = df["avg_roi"]
+    
+    q1, median, q3 = df.select([
+        pl.col("avg_roi").quantile(q, interpolation="linear").alias(f"q{int(q * 100)}")
+        for q in (0.25, 0.5, 0.75)
+    ]).row(0)
+    if q1 is None:
+        # Aucune valeur exploitable (vide ou uniquement des nulls) : boîte vide
+        return [(go.Box(y=[], name=name, line=_LINE_ROI_THIN), row, col, False)]
+    
+    iqr = q3 - q1
+    is_inlier = roi.is_between(q1 - 1.5 * iqr, q3 + 1.5 * iqr)
+    inliers = roi.filter(is_inlier)
+    outliers = roi.filter(~is_inlier)
+    
+    traces = [
+        (
+            go.Box(
+                x=[name],
+                q1=[q1],
+                median=[median],
+                q3=[q3],
+                lowerfence=[inliers.min()],
+                upperfence=[inliers.max()],
+                name=name,
+                line=_LINE_ROI_THIN
+            ),
+            row, col, False
+        )
+    ]
+    
+    if len(outliers) > 0:
+        traces.append((
+            go.Scatter(
+                x=np.full(len(outliers), name, dtype=object),
+                y=_np(outliers),
+                mode="markers",
+                name=name,
+                marker=_MARKER_ROI,
+                showlegend=False
+            ),
+            row, col, False
+        ))
+    
+    return traces
 
 def create_funnel_analysis(df: pl.DataFrame) -> go.Figure:
     """
@@ -327,18 +612,29 @@ def create_funnel_analysis(df: pl.DataFrame) -> go.Figure:
     Returns:
         Figure Plotly
     """
-    # Calcul des métriques d'entonnoir
-    funnel_metrics = [
-        ("Impressions", df["Impressions"].sum()),
-        ("Clics", df["Clicks"].sum()),
-        ("Interactions", (df["Clicks"] * df["Engagement_Score"]/10).sum()),
-        ("Conversions", (df["Clicks"] * df["Conversion_Rate"]).sum())
-    ]
+    # Calcul des métriques d'entonnoir en un seul passage sur les données
+    if njit is not None and len(df) > NUMBA_FUNNEL_THRESHOLD:
+        # Nulls remplacés par 0 : ignorés dans les sommes, comme avec Polars
+        funnel_columns = df.select(
+            pl.col(["Impressions", "Clicks", "Engagement_Score", "Conversion_Rate"])
+            .fill_null(0)
+        )
+        totals = _funnel_totals_numba(*(_np(s) for s in funnel_columns.get_columns()))
+    else:
+        totals = df.lazy().select([
+            pl.col("Impressions").sum(),
+            pl.col("Clicks").sum(),
+            (pl.col("Clicks") * pl.col("Engagement_Score") / 10).sum().alias("Interactions"),
+            (pl.col("Clicks") * pl.col("Conversion_Rate")).sum().alias("Conversions")
+        ]).collect().row(0)
+    
+    labels = ("Impressions", "Clics", "Interactions", "Conversions")
+    values = np.asarray(totals, dtype=np.float64)
     
     # Création du graphique en entonnoir
     fig = go.Figure(go.Funnel(
-        y=[x[0] for x in funnel_metrics],
-        x=[x[1] for x in funnel_metrics],
+        y=labels,
+        x=values,
         textinfo="value+percent initial"
     ))
     
@@ -366,18 +662,20 @@ def create_heatmap_analysis(
     Returns:
         Figure Plotly
     """
-    # Filtrage par segment si nécessaire
+    # Filtrage par segment si nécessaire ; le plan paresseux ne lit que
+    # les colonnes utiles avant d'appliquer le filtre
+    lf = df.lazy()
     if segments:
-        df = df.filter(pl.col("Customer_Segment").is_in(segments))
+        lf = lf.filter(pl.col("Customer_Segment").is_in(segments))
     
     # Calcul des corrélations
-    corr_matrix = df.select(metrics).corr()
+    corr_matrix = lf.select(metrics).collect().corr()
     
     # Création de la heatmap
     fig = go.Figure(data=go.Heatmap(
-        z=corr_matrix,
-        x=metrics,
-        y=metrics,
+        z=corr_matrix.to_numpy(),
+        x=list(metrics),
+        y=list(metrics),
         colorscale="RdBu",
         zmin=-1,
         zmax=1
@@ -390,4 +688,33 @@ def create_heatmap_analysis(
         yaxis_title="Métriques"
     )
     
-    return fig
\ No newline at end of file
+    return fig
+
+def _json_default(obj: Any) -> Any:
+    """Convertit pour orjson les tableaux qu'il ne sérialise pas nativement."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Type non sérialisable: {type(obj).__name__}")
+
+def fig_to_json_fast(fig: go.Figure) -> str:
+    """
+    Sérialise une figure en JSON avec orjson (tableaux NumPy encodés en C).
+    À privilégier à `fig.to_json()` dans les callbacks Dash ; repli sur
+    `fig.to_json()` si orjson n'est pas installé.
+    
+    Args:
+        fig: Figure Plotly à sérialiser
+        
+    Returns:
+        Chaîne JSON de la figure
+    """
+    if orjson is None:
+        return fig.to_json()
+    
+    return orjson.dumps(
+        fig.to_plotly_json(),
+        default=_json_default,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    ).decode()
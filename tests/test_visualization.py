@@ -0,0 +1,59 @@
+"""
+Tests des fonctions de visualisation.
+"""
+
+import polars as pl
+import pytest
+
+from src.marketing_analysis import visualization
+from src.marketing_analysis.visualization import (
+    create_channel_analysis,
+    create_funnel_analysis
+)
+
+
+def _channel_frame(channels: list[str]) -> pl.DataFrame:
+    """Construit un DataFrame de performances par canal à valeurs fixes."""
+    return pl.DataFrame({
+        "Channel_Used": channels,
+        "avg_roi": [5.0, 4.0],
+        "avg_engagement": [6.0, 7.0]
+    }).with_columns(pl.col("Channel_Used").cast(pl.Categorical))
+
+
+def test_fig_cache_distinguishes_relabelled_categories():
+    """Deux canaux différents aux mêmes valeurs ne partagent pas la figure en cache."""
+    fig_a = create_channel_analysis(_channel_frame(["Facebook", "Website"]))
+    fig_b = create_channel_analysis(_channel_frame(["Email", "Instagram"]))
+
+    assert list(fig_a.data[0].x) == ["Facebook", "Website"]
+    assert list(fig_b.data[0].x) == ["Email", "Instagram"]
+
+
+def test_funnel_numba_path_matches_polars_with_nulls(monkeypatch):
+    """Le noyau Numba ignore les nulls comme l'agrégation Polars."""
+    pytest.importorskip("numba")
+
+    df = pl.DataFrame({
+        "Impressions": [1000, 2000, None, 1500],
+        "Clicks": [100, None, 50, 80],
+        "Engagement_Score": [6.0, 7.0, None, 8.0],
+        "Conversion_Rate": [0.05, 0.1, 0.08, None]
+    })
+
+    expected = list(create_funnel_analysis(df).data[0].x)
+
+    monkeypatch.setattr(visualization, "NUMBA_FUNNEL_THRESHOLD", 0)
+    actual = list(create_funnel_analysis(df).data[0].x)
+
+    assert actual == pytest.approx(expected)
+
+
+def test_metrics_subplot_handles_all_null_roi():
+    """Sans valeur de ROI, le sous-graphique se réduit à une boîte vide."""
+    df = pl.DataFrame({"avg_roi": [None, None]}, schema={"avg_roi": pl.Float64})
+
+    traces = visualization._build_metrics_subplot(df, 2, 2)
+
+    assert len(traces) == 1
+    assert len(traces[0][0].y) == 0